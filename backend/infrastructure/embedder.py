@@ -1,32 +1,161 @@
 import logging
+import os
+import re
+import shelve
+from hashlib import blake2b
 import numpy as np
+import torch
 from typing import List, Union
 from sentence_transformers import SentenceTransformer
 
 logger = logging.getLogger(__name__)
 
+# Use all cores for CPU-side tensor ops (tokenization, pooling)
+torch.set_num_threads(os.cpu_count())
+
+
+# Default encode batch size per device. Large batches amortize per-batch
+# Python and kernel-launch overhead; sentence-transformers length-sorts
+# within a batch, so bigger batches also pack padding better. Don't shrink
+# these below 64 without a concrete memory reason.
+DEVICE_BATCH_SIZES = {
+    "cuda": 1024,
+    "mps": 128,
+    "cpu": 128,
+}
+
 
 class EmbeddingService:
-    def __init__( self, model_name: str = None, device: str = None, cache_dir: str = None ):
+    def __init__( self, model_name: str = None, device: str = None, cache_dir: str = None, use_cache: bool = True,
+        backend: str = "onnx", precision: str = "fp16" ):
         self.model_name ="sentence-transformers/LaBSE"
         self.device = "mps"
         self.cache_dir = "cache/"
+        self.use_cache = use_cache
+        self.backend = backend
+        self.precision = precision
+
+        # In-process cache: hex digest of (model_name, text) -> embedding vector.
+        # A shelve file under cache_dir persists hits across runs.
+        self._cache = {}
+        self._disk_cache_path = os.path.join(self.cache_dir, "embeddings_cache")
 
         logger.info(f"Initializing EmbeddingService with model: {self.model_name}")
         logger.info(f"Device: {self.device}, Cache dir: {self.cache_dir}")
 
+        # Prefer the ONNX Runtime backend (exported and cached by
+        # sentence-transformers on first load); fall back to the stock
+        # PyTorch backend if onnxruntime or the export is unavailable.
+        if self.backend == "onnx":
+            try:
+                self.model = SentenceTransformer(
+                    self.model_name,
+                    device=self.device,
+                    cache_folder=self.cache_dir,
+                    backend="onnx"
+                )
+                logger.info("EmbeddingService initialized with ONNX backend")
+                self._warmup()
+                return
+            except Exception as e:
+                logger.warning(f"ONNX backend unavailable ({e}), falling back to torch")
+                self.backend = "torch"
+
         try:
             self.model = SentenceTransformer(
                 self.model_name,
                 device=self.device,
                 cache_folder=self.cache_dir
             )
+            # Halve weight/activation width on the torch backend: doubles
+            # matmul throughput on MPS and the FP16 error is negligible for
+            # L2-normalized embeddings. Cached vectors stay float32 numpy.
+            if self.precision == "fp16":
+                try:
+                    self.model.half()
+                    logger.info("Running LaBSE in FP16")
+                except Exception as e:
+                    logger.warning(f"FP16 not supported on this device ({e}), staying in FP32")
             logger.info("EmbeddingService initialized successfully")
+            self._warmup()
         except Exception as e:
             logger.error(f"Failed to initialize embedding model: {e}")
             raise RuntimeError(f"Failed to initialize embedding model: {e}")
 
-    def encode( self, texts: Union[str, List[str]], batch_size=16, normalize: bool = True,
+    def _warmup(self):
+        """Run one tiny encode so first-call device/shader setup (notably
+        Metal shader compilation on MPS) happens at startup, not on the
+        first real batch."""
+        try:
+            with torch.inference_mode():
+                self.model.encode(["x"], batch_size=1, convert_to_numpy=True)
+            logger.debug("Embedding model warmed up")
+        except Exception as e:
+            logger.warning(f"Embedding warmup failed: {e}")
+
+    def _encode_sorted(self, texts: List[str], batch_size: int, normalize: bool,
+        show_progress: bool
+    ) -> np.ndarray:
+        """
+        Encode texts sorted by length so each mini-batch pads to similar
+        sequence lengths (SBERT-style smart batching), then restore the
+        original order before returning.
+        """
+        order = np.argsort([len(t) for t in texts])
+
+        # inference_mode goes further than the no_grad encode already uses:
+        # it also skips autograd version-counter bookkeeping
+        with torch.inference_mode():
+            embeddings = self.model.encode(
+                [texts[i] for i in order],
+                batch_size=batch_size,
+                normalize_embeddings=normalize,
+                device=self.device,
+                convert_to_numpy=True,
+                show_progress_bar=show_progress
+            )
+
+        inverse = np.argsort(order)
+        return embeddings[inverse]
+
+    _WS_RE = re.compile(r"\s+")
+
+    def _cache_key(self, text: str, normalize: bool) -> str:
+        """Content hash identifying a text for this model and output mode.
+
+        Whitespace is collapsed before hashing so trivially reformatted
+        copies of a text (re-wrapped lines, doubled spaces) reuse the
+        cached vector instead of triggering a fresh encode. The normalize
+        flag is part of the key: normalized and raw vectors differ, so
+        they must not share cache entries.
+        """
+        h = blake2b(digest_size=16)
+        h.update(self.model_name.encode("utf-8"))
+        h.update(b"norm" if normalize else b"raw")
+        h.update(self._WS_RE.sub(" ", text).strip().encode("utf-8"))
+        return h.hexdigest()
+
+    def _load_from_disk(self, keys: List[str]) -> None:
+        """Pull any persisted embeddings for the given keys into the in-process cache."""
+        try:
+            with shelve.open(self._disk_cache_path) as db:
+                for key in keys:
+                    if key not in self._cache and key in db:
+                        self._cache[key] = db[key]
+        except Exception as e:
+            logger.warning(f"Could not read embedding disk cache: {e}")
+
+    def _save_to_disk(self, items: dict) -> None:
+        """Persist freshly computed embeddings to the on-disk cache."""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with shelve.open(self._disk_cache_path) as db:
+                for key, vector in items.items():
+                    db[key] = vector
+        except Exception as e:
+            logger.warning(f"Could not write embedding disk cache: {e}")
+
+    def encode( self, texts: Union[str, List[str]], batch_size=None, normalize: bool = True,
         show_progress: bool = False
     ) -> np.ndarray:
 
@@ -34,19 +163,41 @@ class EmbeddingService:
         if isinstance(texts, str):
             texts = [texts]
 
-        batch_size = batch_size 
+        if batch_size is None:
+            batch_size = DEVICE_BATCH_SIZES.get(self.device, 128)
 
         try:
             logger.debug(f"Encoding {len(texts)} texts with batch_size={batch_size}")
 
-            embeddings = self.model.encode(
-                texts,
-                batch_size=batch_size,
-                normalize_embeddings=normalize,
-                device=self.device,
-                convert_to_numpy=True,
-                show_progress_bar=show_progress
-            )
+            if not self.use_cache:
+                embeddings = self._encode_sorted(texts, batch_size, normalize, show_progress)
+                logger.debug(f"Generated embeddings with shape: {embeddings.shape}")
+                return embeddings
+
+            # Look each text up in the cache and only encode the misses
+            keys = [self._cache_key(t, normalize) for t in texts]
+            self._load_from_disk(keys)
+
+            # Repeated texts share a cache key, so collect each missing key
+            # once — a corpus with duplicate paragraphs is encoded deduplicated
+            unique_misses = {}
+            for i, key in enumerate(keys):
+                if key not in self._cache and key not in unique_misses:
+                    unique_misses[key] = texts[i]
+
+            if unique_misses:
+                logger.debug(f"Cache misses: {len(unique_misses)}/{len(texts)}")
+                new_embeddings = self._encode_sorted(
+                    list(unique_misses.values()), batch_size, normalize, show_progress
+                )
+                new_items = dict(zip(unique_misses, new_embeddings))
+                self._cache.update(new_items)
+                self._save_to_disk(new_items)
+            else:
+                logger.debug(f"All {len(texts)} texts served from cache")
+
+            # Splice cached and fresh vectors back together in input order
+            embeddings = np.stack([self._cache[key] for key in keys])
 
             logger.debug(f"Generated embeddings with shape: {embeddings.shape}")
             return embeddings
@@ -71,6 +222,9 @@ def get_embedding_service() -> EmbeddingService:
     """
     Get the global EmbeddingService instance (singleton pattern).
 
+    Call this once at application start so model load and device warmup
+    happen before the first request rather than inside it.
+
     Returns:
         EmbeddingService instance
     """
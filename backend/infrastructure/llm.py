@@ -1,6 +1,8 @@
 """GROQ LLM client implementation (raw output, no cleaning)"""
+import io
 import logging
-from groq import Groq
+import httpx
+from groq import Groq, AsyncGroq
 from dotenv import load_dotenv
 import os
 load_dotenv()
@@ -21,7 +23,14 @@ class GroqClient():
         self.default_temperature = 0
         self.default_max_tokens = 1024
 
-        self.client = Groq(api_key=self.api_key)
+        # One httpx client with keep-alive so concurrent label/description
+        # calls reuse TCP/TLS connections instead of re-handshaking
+        self.client = Groq(
+            api_key=self.api_key,
+            http_client=httpx.Client(
+                limits=httpx.Limits(max_connections=64, keepalive_expiry=60)
+            )
+        )
         logger.info(f"Initialized GROQ client with model: {self.model}")
 
     def generate( self, prompt: str,stream=True) :
@@ -45,11 +54,10 @@ class GroqClient():
             )
 
             if stream:
-                response_parts = []
+                buf = io.StringIO()
                 for chunk in completion:
-                    delta = chunk.choices[0].delta.content or ""
-                    response_parts.append(delta)
-                response = "".join(response_parts)
+                    buf.write(chunk.choices[0].delta.content or "")
+                response = buf.getvalue()
             else:
                 response = completion.choices[0].message.content
 
@@ -58,3 +66,98 @@ class GroqClient():
 
         except Exception as e:
             logger.error(f"GROQ generation failed: {e}")
+
+    def generate_stream(self, prompt: str):
+        """
+        Yield response deltas as they arrive, for callers that want to
+        consume partial output instead of waiting for the full response.
+        """
+        try:
+            completion = self.client.chat.completions.create(
+                model=self.model,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=self.default_temperature,
+                max_completion_tokens=self.default_max_tokens,
+                top_p= 0.95,
+                stream=True,
+                include_reasoning=False
+            )
+
+            for chunk in completion:
+                delta = chunk.choices[0].delta.content or ""
+                if delta:
+                    yield delta
+
+        except Exception as e:
+            logger.error(f"GROQ streaming generation failed: {e}")
+
+
+class AsyncGroqClient():
+    """
+    Async GROQ client for issuing many label/description calls concurrently.
+
+    Same model and sampling settings as GroqClient; callers gather the
+    coroutines and cap concurrency with a semaphore.
+    """
+
+    def __init__(self):
+        self.api_key = api_key
+        self.model =  "qwen/qwen3-32b"
+        self.default_temperature = 0
+        self.default_max_tokens = 1024
+
+        self.client = AsyncGroq(api_key=self.api_key)
+        logger.info(f"Initialized async GROQ client with model: {self.model}")
+
+    async def generate(self, prompt: str):
+        """
+        Generate text completion from GROQ asynchronously (raw response).
+        """
+        try:
+            completion = await self.client.chat.completions.create(
+                model=self.model,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=self.default_temperature,
+                max_completion_tokens=self.default_max_tokens,
+                top_p= 0.95,
+                stream=False,
+                include_reasoning=False
+            )
+
+            response = completion.choices[0].message.content
+            logger.debug(f"Generated raw response: {response[:100]}...")
+            return response
+
+        except Exception as e:
+            logger.error(f"Async GROQ generation failed: {e}")
+
+
+# Global GROQ client instances
+_groq_client = None
+_async_groq_client = None
+
+
+def get_groq_client() -> GroqClient:
+    """
+    Get the global GroqClient instance (singleton pattern).
+
+    Returns:
+        GroqClient instance
+    """
+    global _groq_client
+    if _groq_client is None:
+        _groq_client = GroqClient()
+    return _groq_client
+
+
+def get_async_groq_client() -> AsyncGroqClient:
+    """
+    Get the global AsyncGroqClient instance (singleton pattern).
+
+    Returns:
+        AsyncGroqClient instance
+    """
+    global _async_groq_client
+    if _async_groq_client is None:
+        _async_groq_client = AsyncGroqClient()
+    return _async_groq_client
@@ -7,8 +7,8 @@ import nltk
 
 nltk.download("stopwords")
 
-stopwords_ar = set(stopwords.words("arabic"))
-stopwords_en = set(stopwords.words("english"))
+stopwords_ar = frozenset(stopwords.words("arabic"))
+stopwords_en = frozenset(stopwords.words("english"))
 
 # Load Stanza (Arabic)
 stanza.download("ar")
@@ -19,44 +19,75 @@ nlp_en = spacy.load("en_core_web_sm")
 
 # --- POS tags to keep ---
 # (Focus on content words: nouns, verbs, adjectives, adverbs)
-KEEP_TAGS_AR = {"NOUN", "VERB", "ADJ", "ADV"}
-KEEP_TAGS_EN = {"NOUN", "PROPN", "VERB", "ADJ", "ADV"}
+KEEP_TAGS_AR = frozenset({"NOUN", "VERB", "ADJ", "ADV"})
+KEEP_TAGS_EN = frozenset({"NOUN", "PROPN", "VERB", "ADJ", "ADV"})
+
+# Precompiled patterns for clean_text (called once per paragraph)
+_WHITESPACE_RE = re.compile(r"[\n\t\r]+")
+_TOKEN_RE = re.compile(r"[ء-ي]+|[a-zA-Z]+")
 
 
 def clean_text(text: str):
     """Basic text normalization and character filtering."""
     text = text.strip()
-    text = re.sub(r"[\n\t\r]+", " ", text)
-    text = " ".join(re.findall(r"[ء-ي]+|[a-zA-Z]+", text))
+    text = _WHITESPACE_RE.sub(" ", text)
+    text = " ".join(_TOKEN_RE.findall(text))
     return text
 
 
+def _filter_ar_doc(doc):
+    """Extract kept lemmas from a processed Stanza document."""
+    tokens = []
+    for sent in doc.sentences:
+        for word in sent.words:
+            if (
+                word.upos in KEEP_TAGS_AR
+                and word.lemma not in stopwords_ar
+                and len(word.lemma) > 1
+            ):
+                tokens.append(word.lemma)
+    return tokens
+
+
+def _filter_en_doc(doc):
+    """Extract kept lemmas from a processed SpaCy document."""
+    return [
+        token.lemma_.lower()
+        for token in doc
+        if (
+            token.pos_ in KEEP_TAGS_EN
+            and token.text.lower() not in stopwords_en
+            and len(token.lemma_) > 1
+        )
+    ]
+
+
 def preprocess(text: str, lang="ar"):
     """Full preprocessing pipeline: clean, lemmatize, POS-filter, remove stopwords."""
     text = clean_text(text)
 
     if lang == "ar":
-        doc = nlp_ar(text)
-        tokens = []
-        for sent in doc.sentences:
-            for word in sent.words:
-                if (
-                    word.upos in KEEP_TAGS_AR
-                    and word.lemma not in stopwords_ar
-                    and len(word.lemma) > 1
-                ):
-                    tokens.append(word.lemma)
+        tokens = _filter_ar_doc(nlp_ar(text))
     else:
-        doc = nlp_en(text)
-        tokens = [
-            token.lemma_.lower()
-            for token in doc
-            if (
-                token.pos_ in KEEP_TAGS_EN
-                and token.text.lower() not in stopwords_en
-                and len(token.lemma_) > 1
-            )
-        ]
+        tokens = _filter_en_doc(nlp_en(text))
 
     return " ".join(tokens)
 
+
+def preprocess_batch(texts, lang="ar"):
+    """Preprocess many texts in one batched pipeline pass.
+
+    Feeds all documents to Stanza/SpaCy at once instead of one call per
+    text, which is much faster than looping over `preprocess`.
+    """
+    cleaned = [clean_text(t) for t in texts]
+
+    if lang == "ar":
+        docs = nlp_ar.bulk_process(cleaned)
+        return [" ".join(_filter_ar_doc(doc)) for doc in docs]
+
+    return [
+        " ".join(_filter_en_doc(doc))
+        for doc in nlp_en.pipe(cleaned, batch_size=64)
+    ]
+
@@ -2,14 +2,27 @@
 import logging
 import numpy as np
 from typing import List
+from scipy.cluster.hierarchy import linkage, to_tree
 from sklearn.decomposition import TruncatedSVD
-from sklearn.cluster import AgglomerativeClustering
+from sklearn.cluster import AgglomerativeClustering, MiniBatchKMeans
+from sklearn.neighbors import kneighbors_graph
+
+try:
+    # fastcluster's C++ nearest-neighbor-chain ward works from the raw
+    # observation matrix in O(n) memory, several-fold faster than scipy's
+    # linkage on the same data; the output format is identical
+    from fastcluster import linkage_vector as _ward_linkage_vector
+except ImportError:
+    _ward_linkage_vector = None
 
 
 logger = logging.getLogger("Clustering")
 
 SVD_COMPONENTS: int = 20
 MIN_CLUSTER_SIZE_RATIO: float = 0.15
+# Above this sample count, flat clustering switches from ward (O(n^2)
+# memory) to MiniBatchKMeans (linear in n)
+KMEANS_THRESHOLD: int = 2000
 
 class ClusteringService:
 
@@ -23,6 +36,11 @@ class ClusteringService:
         n_components = n_components or self.svd_components
         n_components = min(n_components, embeddings.shape[1], embeddings.shape[0])
 
+        # float32 halves bandwidth through the Lanczos iterations and keeps
+        # the output dtype consistent for every caller, not just the
+        # recursive pipeline's root cast
+        embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+
         logger.debug(f"Reducing dimensions from {embeddings.shape[1]} to {n_components}")
 
         svd = TruncatedSVD(n_components=n_components, random_state=42)
@@ -62,10 +80,34 @@ class ClusteringService:
         logger.debug(f"Clustering {n_samples} samples into {n_clusters} clusters")
 
         try:
-            clusterer = AgglomerativeClustering(
-                n_clusters=n_clusters,
-                linkage='ward'
-            )
+            if n_samples > KMEANS_THRESHOLD:
+                # Even structured ward gets expensive at this size;
+                # MiniBatchKMeans scales linearly with n at comparable
+                # quality for normalized embeddings
+                clusterer = MiniBatchKMeans(
+                    n_clusters=n_clusters,
+                    batch_size=256,
+                    n_init=3,
+                    random_state=42
+                )
+            else:
+                # Past a few hundred samples, dense ward's O(n^2) distance
+                # work dominates; a kNN connectivity graph switches sklearn
+                # into structured mode, which only merges along graph edges
+                connectivity = None
+                if n_samples >= 500:
+                    connectivity = kneighbors_graph(
+                        embeddings,
+                        n_neighbors=min(20, n_samples - 1),
+                        include_self=False,
+                        n_jobs=-1
+                    )
+
+                clusterer = AgglomerativeClustering(
+                    n_clusters=n_clusters,
+                    linkage='ward',
+                    connectivity=connectivity
+                )
             labels = clusterer.fit_predict(embeddings)
 
             # Log cluster distribution
@@ -78,6 +120,59 @@ class ClusteringService:
             logger.error(f"Clustering failed: {e}")
             raise ValueError(f"Clustering operation failed: {e}")
 
+    def build_cluster_tree(self, embeddings: np.ndarray):
+        """Compute the full ward dendrogram for the given rows.
+
+        One O(n^2) linkage pass at the root replaces a fresh
+        AgglomerativeClustering fit per recursion level on overlapping
+        subsets; callers split the returned tree with split_cluster_tree.
+        """
+        logger.debug(f"Building ward linkage over {embeddings.shape[0]} samples")
+        if _ward_linkage_vector is not None:
+            Z = _ward_linkage_vector(
+                np.ascontiguousarray(embeddings, dtype=np.float64), method='ward'
+            )
+        else:
+            Z = linkage(embeddings, method='ward')
+        return to_tree(Z)
+
+    def split_cluster_tree(self, node, n_clusters: int):
+        """Cut a dendrogram subtree into up to n_clusters flat clusters.
+
+        Greedily opens the cluster with the highest merge distance, which
+        for a monotonic linkage like ward matches fcluster's maxclust
+        criterion. Returns fewer clusters if the subtree runs out of
+        internal nodes.
+        """
+        clusters = [node]
+        while len(clusters) < n_clusters:
+            top_idx = max(range(len(clusters)), key=lambda i: clusters[i].dist)
+            top = clusters[top_idx]
+            if top.is_leaf():
+                break
+            clusters.pop(top_idx)
+            clusters.extend((top.get_left(), top.get_right()))
+
+        logger.debug(f"Cut dendrogram subtree into {len(clusters)} clusters")
+        return clusters
+
+    def split_indices_by_clusters(self, labels: np.ndarray):
+        """Map each cluster label to the index array of its members.
+
+        Callers slice their own data/embeddings with the returned indices,
+        avoiding the per-cluster list copies of split_by_clusters.
+
+        One stable argsort partitions all clusters at once (O(n log n))
+        instead of scanning the label array again for every cluster.
+        """
+        clusters = {
+            int(label): group
+            for label, group in zip(*self._partition_by_label(labels))
+        }
+
+        logger.debug(f"Split indices into {len(clusters)} clusters")
+        return clusters
+
     def split_by_clusters(self,data: List,labels: np.ndarray) :
 
         if len(data) != len(labels):
@@ -85,10 +180,18 @@ class ClusteringService:
                 f"Data length ({len(data)}) doesn't match labels length ({len(labels)})"
             )
 
-        clusters = {}
-        for label in np.unique(labels):
-            indices = np.where(labels == label)[0]
-            clusters[int(label)] = [data[i] for i in indices]
+        # Same single-argsort partition as split_indices_by_clusters; only
+        # the final per-cluster item lists differ
+        clusters = {
+            int(label): [data[i] for i in group]
+            for label, group in zip(*self._partition_by_label(labels))
+        }
 
         logger.debug(f"Split data into {len(clusters)} clusters")
         return clusters
+
+    def _partition_by_label(self, labels: np.ndarray):
+        """One stable argsort partitioning of all clusters at once."""
+        unique, counts = np.unique(labels, return_counts=True)
+        order = np.argsort(labels, kind="stable")
+        return unique, np.split(order, np.cumsum(counts)[:-1])
@@ -1,4 +1,5 @@
 import numpy as np
+from dataclasses import dataclass
 from typing import List, Dict, Any
 from backend.src.core.clustering import ClusteringService
 
@@ -6,6 +7,18 @@ from backend.src.core.clustering import ClusteringService
 cluster_service = ClusteringService()
 
 
+@dataclass(frozen=True, slots=True)
+class ClusterContext:
+    """Per-run invariants shared by every level of the recursion.
+
+    Bundling these keeps each recursive frame down to a dendrogram node
+    plus depth parameters — no array or text-list copies per child.
+    """
+    embeddings: np.ndarray
+    reduced: np.ndarray
+    texts: List[str]
+
+
 def recursive_cluster(
     embeddings: np.ndarray,
     texts: List[str],
@@ -14,30 +27,73 @@ def recursive_cluster(
     min_size: int = 2
 ) -> Dict[str, Any]:
 
-    n_samples = len(texts)
+    # Small corpora never split, so don't pay for the SVD and linkage at
+    # all — return the single-node tree the base condition would produce
+    if depth >= max_depth or len(texts) < max(2, min_size):
+        return {
+            "depth": depth,
+            "size": len(texts),
+            "texts": list(texts)
+        }
+
+    # Keep the whole clustering pipeline in float32: half the memory
+    # bandwidth of float64 with no measurable effect on ward splits.
+    # (float16 is not worth it here — scikit-learn upcasts it to float64
+    # internally, costing more than it saves.)
+    embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+
+    # All the expensive linear algebra happens once at the root: a single
+    # SVD on the full matrix, then a single ward linkage over the reduced
+    # rows. The recursion below only walks the resulting dendrogram, so
+    # deep trees pay one O(n^2) clustering pass instead of one per node.
+    ctx = ClusterContext(
+        embeddings=embeddings,
+        reduced=cluster_service.reduce_dimensions(embeddings).astype(np.float32, copy=False),
+        texts=texts
+    )
+    root = cluster_service.build_cluster_tree(ctx.reduced)
+    return _cluster_node(ctx, root, depth, max_depth, min_size)
+
 
-    # Base condition: stop splitting if too shallow or small
-    if depth >= max_depth or n_samples < min_size:
+def _cluster_node(
+    ctx: ClusterContext,
+    dendro_node,
+    depth: int,
+    max_depth: int,
+    min_size: int
+) -> Dict[str, Any]:
+
+    indices = dendro_node.pre_order()
+    n_samples = len(indices)
+    node_texts = [ctx.texts[i] for i in indices]
+
+    # Base condition: stop splitting if too shallow or small. Any split of
+    # fewer than 2 * min_size samples would leave at least one child below
+    # min_size, so don't bother cutting at all.
+    if depth >= max_depth or n_samples < max(min_size, 2 * min_size):
         return {
             "depth": depth,
             "size": n_samples,
-            "texts": texts
+            "texts": node_texts
         }
 
-    # Reduce embedding dimensions for stability
-    reduced_embeddings = cluster_service.reduce_dimensions(embeddings)
+    # Cut this subtree of the shared dendrogram into flat clusters
+    n_clusters = max(2, min(2 + depth, n_samples))
+    children = cluster_service.split_cluster_tree(dendro_node, n_clusters)
 
-    # Perform clustering
-    labels = cluster_service.cluster_embeddings(reduced_embeddings, depth=depth)
-
-    # Split data and embeddings by cluster
-    text_clusters = cluster_service.split_by_clusters(texts, labels)
-    embedding_clusters = cluster_service.split_by_clusters(reduced_embeddings, labels)
+    # A degenerate cut (one child holding nearly everything) would recurse
+    # on a near-identical subproblem; treat the node as a leaf instead
+    if len(children) <= 1 or max(c.get_count() for c in children) > 0.9 * n_samples:
+        return {
+            "depth": depth,
+            "size": n_samples,
+            "texts": node_texts
+        }
 
     # Log cluster structure
     result_tree = {
         "depth": depth,
-        "n_clusters": len(text_clusters),
+        "n_clusters": len(children),
         "clusters": {}
     }
 
@@ -49,16 +105,14 @@ def recursive_cluster(
         min_size_base=min_size
     )
 
-    # Recursively process subclusters
-    for label, sub_texts in text_clusters.items():
-        sub_embeddings = np.array(embedding_clusters[label])
-
-        result_tree["clusters"][int(label)] = recursive_cluster(
-            embeddings=sub_embeddings,
-            texts=sub_texts,
-            depth=depth + 1,
-            max_depth=max_depth_dynamic,
-            min_size=min_size_dynamic
+    # Recursively process each dendrogram subtree
+    for label, child in enumerate(children):
+        result_tree["clusters"][label] = _cluster_node(
+            ctx,
+            child,
+            depth + 1,
+            max_depth_dynamic,
+            min_size_dynamic
         )
 
     return result_tree
@@ -1,14 +1,20 @@
 import logging
-from backend.infrastructure.llm import GroqClient
+from backend.infrastructure.llm import get_groq_client, get_async_groq_client
+from backend.utils.llm_cache import LLMCache
 from langchain_core.output_parsers import JsonOutputParser 
-from langchain.prompts import ChatPromptTemplate
 from pydantic import BaseModel, Field
 import re
-import json
-from json import JSONDecodeError
+import orjson
 
 logger = logging.getLogger("NodeDescription")
 
+# Compiled once: fast-path description extraction, JSON object span, markdown fences.
+# The capture excludes backslashes so strings with escape sequences fail the
+# fast path and get decoded properly by the JSON parser instead.
+_DESC_RE = re.compile(r'\{[^{}]*"description"\s*:\s*"([^"\\]+)"[^{}]*\}')
+_JSON_OBJ_RE = re.compile(r"\{[\s\S]*\}")
+_FENCE_RE = re.compile(r"^```(json)?|```$", re.MULTILINE)
+
 
 class MindmapNodeDescription(BaseModel):
     description: str = Field(..., description="Clear 1-2 sentence summary describing the content and key concepts")
@@ -16,10 +22,14 @@ class MindmapNodeDescription(BaseModel):
 
 class NodeDescriptionService:
     def __init__(self):
-        self.llm = GroqClient()
-        self.parser = JsonOutputParser(pydantic_object=MindmapNodeDescription)
-
-        self.prompt = ChatPromptTemplate.from_template("""
+        self.llm = get_groq_client()
+        self.async_llm = get_async_groq_client()
+        self.cache = LLMCache()
+        # Precompute the JSON format instructions once; the prompt itself is a
+        # plain string formatted per call (no LangChain template machinery).
+        self._format_instructions = JsonOutputParser(pydantic_object=MindmapNodeDescription).get_format_instructions()
+
+        self.prompt = """
 You are writing a concise description for a node in a mindmap.
 
 Node Label: {label}
@@ -42,85 +52,114 @@ Return ONLY valid JSON in this exact format in {lang}:
 Example outputs:
 {{"description": "various machine learning algorithms including supervised and unsupervised learning approaches, with focus on their practical applications."}}
 {{"description": "Discusses the environmental and economic impacts of climate change on coastal communities and proposed adaptation strategies."}}
-""")
+"""
+
+    def _build_prompt(self, texts, label, depth, lang):
+        """Format the description prompt, or None if there is no usable text."""
+        # Use more text for better context
+        joined_text = " ".join(texts[:10]) if texts else ""
+
+        # Truncate if too long (keep first 1500 chars for descriptions)
+        if len(joined_text) > 1500:
+            joined_text = joined_text[:1500] + "..."
+
+        if not joined_text.strip():
+            return None
+
+        return self.prompt.format(
+            format_instructions=self._format_instructions,
+            label=label or "Unknown Topic",
+            depth=depth,
+            text_samples=joined_text,
+            lang=lang
+        )
 
     def generate_description(self, texts, label=None, depth=0,lang='Arabic'):
         try:
-            # Use more text for better context
-            joined_text = " ".join(texts[:10]) if texts else ""
-            
-            # Truncate if too long (keep first 1500 chars for descriptions)
-            if len(joined_text) > 1500:
-                joined_text = joined_text[:1500] + "..."
-            
-            if not joined_text.strip():
+            formatted_prompt = self._build_prompt(texts, label, depth, lang)
+            if formatted_prompt is None:
                 logger.warning("⚠️ No text samples provided for description")
                 return self._create_fallback_description(label)
 
-            formatted_prompt = self.prompt.format(
-                format_instructions=self.parser.get_format_instructions(),
-                label=label or "Unknown Topic",
-                depth=depth,
-                text_samples=joined_text,
-                lang=lang
-            )
-
-            llm_output = self.llm.generate(formatted_prompt)
-            
-            if not llm_output or not llm_output.strip():
-                logger.warning(f"⚠️ Empty LLM output for '{label}'")
+            cache_key = self.cache.make_key(self.llm.model, formatted_prompt)
+            llm_output = self.cache.get(cache_key)
+            if llm_output is None:
+                llm_output = self.llm.generate(formatted_prompt)
+                if llm_output and llm_output.strip():
+                    self.cache.set(cache_key, llm_output)
+            return self._parse_output(llm_output, label)
+
+        except Exception as e:
+            logger.error(f"❌ Description generation failed for '{label}': {e}")
+            return self._create_fallback_description(label)
+
+    async def generate_description_async(self, texts, label=None, depth=0,lang='Arabic'):
+        """Async variant of generate_description for concurrent sibling enrichment."""
+        try:
+            formatted_prompt = self._build_prompt(texts, label, depth, lang)
+            if formatted_prompt is None:
+                logger.warning("⚠️ No text samples provided for description")
                 return self._create_fallback_description(label)
 
-            # Extract JSON substring if surrounded by text or markdown
-            match = re.search(r"\{[\s\S]*\}", llm_output)
-            cleaned_output = match.group(0).strip() if match else llm_output.strip()
+            cache_key = self.cache.make_key(self.async_llm.model, formatted_prompt)
+            llm_output = self.cache.get(cache_key)
+            if llm_output is None:
+                llm_output = await self.async_llm.generate(formatted_prompt)
+                if llm_output and llm_output.strip():
+                    self.cache.set(cache_key, llm_output)
+            return self._parse_output(llm_output, label)
 
-            # Remove markdown fences like ```json ... ```
-            cleaned_output = re.sub(r"^```(json)?|```$", "", cleaned_output, flags=re.MULTILINE).strip()
+        except Exception as e:
+            logger.error(f"❌ Description generation failed for '{label}': {e}")
+            return self._create_fallback_description(label)
+
+    def _parse_output(self, llm_output, label):
+        """Parse and validate raw LLM output into a description string."""
+        if not llm_output or not llm_output.strip():
+            logger.warning(f"⚠️ Empty LLM output for '{label}'")
+            return self._create_fallback_description(label)
+
+        # Fast path: pull the description straight out with one compiled pattern
+        match = _DESC_RE.search(llm_output)
+        if match:
+            result = MindmapNodeDescription(description=match.group(1))
+        else:
+            # Slow path: isolate the JSON object, strip fences, parse with orjson
+            match = _JSON_OBJ_RE.search(llm_output)
+            cleaned_output = match.group(0).strip() if match else llm_output.strip()
+            cleaned_output = _FENCE_RE.sub("", cleaned_output).strip()
 
             try:
-                result = self.parser.parse(cleaned_output)
+                result = MindmapNodeDescription(**orjson.loads(cleaned_output))
             except Exception:
-                try:
-                    data = json.loads(cleaned_output)
-                    result = MindmapNodeDescription(**data)
-                except JSONDecodeError:
-                    logger.warning(f"⚠️ Could not parse JSON: {cleaned_output[:120]}...")
-                    return self._create_fallback_description(label)
-
-            # Handle parser returning dict instead of Pydantic object
-            if isinstance(result, dict):
-                result = MindmapNodeDescription(**result)
-
-            # Validate description quality
-            description = getattr(result, "description", "").strip()
-            
-            # Check for invalid/generic descriptions
-            invalid_phrases = [
-                "no description available",
-                "n/a",
-                "unknown",
-                "description not available",
-                "no information",
-                ""
-            ]
-            
-            if not description or description.lower() in invalid_phrases:
-                logger.warning(f"⚠️ Invalid description for '{label}': '{description}'")
+                logger.warning(f"⚠️ Could not parse JSON: {cleaned_output[:120]}...")
                 return self._create_fallback_description(label)
-            
-            # Check if description is too short (less than 10 chars likely invalid)
-            if len(description) < 10:
-                logger.warning(f"⚠️ Description too short for '{label}': '{description}'")
-                return self._create_fallback_description(label)
-
-            logger.info(f"✅ Generated description for '{label}': {description[:80]}...")
-            return description
 
-        except Exception as e:
-            logger.error(f"❌ Description generation failed for '{label}': {e}")
+        # Validate description quality
+        description = getattr(result, "description", "").strip()
+        
+        # Check for invalid/generic descriptions
+        invalid_phrases = [
+            "no description available",
+            "n/a",
+            "unknown",
+            "description not available",
+            "no information",
+            ""
+        ]
+        
+        if not description or description.lower() in invalid_phrases:
+            logger.warning(f"⚠️ Invalid description for '{label}': '{description}'")
+            return self._create_fallback_description(label)
+        
+        # Check if description is too short (less than 10 chars likely invalid)
+        if len(description) < 10:
+            logger.warning(f"⚠️ Description too short for '{label}': '{description}'")
             return self._create_fallback_description(label)
 
+        logger.info(f"✅ Generated description for '{label}': {description[:80]}...")
+        return description
+
     def _create_fallback_description(self, label):
         """Create a simple fallback description"""
         if label and label.strip() and label.lower() not in ["unknown", "unknown topic"]:
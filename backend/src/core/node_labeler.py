@@ -1,15 +1,23 @@
+import asyncio
 import logging
-from backend.infrastructure.llm import GroqClient
+from concurrent.futures import ThreadPoolExecutor
+from backend.infrastructure.llm import get_groq_client, get_async_groq_client
+from backend.utils.llm_cache import LLMCache
 from langchain_core.output_parsers import JsonOutputParser 
-from langchain.prompts import ChatPromptTemplate
 from pydantic import BaseModel, Field
 from typing import List, Optional
 import re
-import json
-from json import JSONDecodeError
+import orjson
 
 logger = logging.getLogger("NodeLabeler")
 
+# Compiled once: fast-path label extraction, JSON object span, markdown fences.
+# The capture excludes backslashes so strings with escape sequences fail the
+# fast path and get decoded properly by the JSON parser instead.
+_LABEL_RE = re.compile(r'\{[^{}]*"label"\s*:\s*"([^"\\]+)"[^{}]*\}')
+_JSON_OBJ_RE = re.compile(r"\{[\s\S]*\}")
+_FENCE_RE = re.compile(r"^```(json)?|```$", re.MULTILINE)
+
 
 class MindmapNode(BaseModel):
     label: str = Field(..., description="Short descriptive label (3-5 words) that captures the main theme")
@@ -17,10 +25,14 @@ class MindmapNode(BaseModel):
 
 class NodeLabelerService:
     def __init__(self):
-        self.llm = GroqClient()
-        self.parser = JsonOutputParser(pydantic_object=MindmapNode)
-
-        self.prompt = ChatPromptTemplate.from_template("""
+        self.llm = get_groq_client()
+        self.async_llm = get_async_groq_client()
+        self.cache = LLMCache()
+        # Precompute the JSON format instructions once; the prompt itself is a
+        # plain string formatted per call (no LangChain template machinery).
+        self._format_instructions = JsonOutputParser(pydantic_object=MindmapNode).get_format_instructions()
+
+        self.prompt = """
 You are creating a descriptive label for a cluster of related text in a mindmap.
 
 Analyze the following text samples and create a SHORT, DESCRIPTIVE label that captures the main theme or topic.
@@ -47,69 +59,122 @@ Example outputs:
 {{"label": "Machine Learning Algorithms"}}
 {{"label": "Climate Change Impacts"}}
 {{"label": "Software Design Patterns"}}
-""")
+"""
+
+    def _build_prompt(self, texts, depth, parent_label, lang):
+        """Format the labeling prompt for a cluster's text samples."""
+        # Use more text samples for better context
+        sample_text = " ".join(texts[:10]) if texts else "N/A"
+
+        # Truncate if too long (keep first 1000 chars)
+        if len(sample_text) > 1000:
+            sample_text = sample_text[:1000] + "..."
+
+        return self.prompt.format(
+            format_instructions=self._format_instructions,
+            text_samples=sample_text,
+            parent_label=parent_label or "Main Topic",
+            depth=depth,
+            lang=lang
+        )
 
     def generate_label(self, texts, depth=0, parent_label=None,lang="Arabic"):
         try:
-            # Use more text samples for better context
-            sample_text = " ".join(texts[:10]) if texts else "N/A"
-            
-            # Truncate if too long (keep first 1000 chars)
-            if len(sample_text) > 1000:
-                sample_text = sample_text[:1000] + "..."
-            
-            formatted_prompt = self.prompt.format(
-                format_instructions=self.parser.get_format_instructions(),
-                text_samples=sample_text,
-                parent_label=parent_label or "Main Topic",
-                depth=depth,
-                lang=lang
-            )
-
-            llm_output = self.llm.generate(formatted_prompt)
-            
-            if not llm_output or not llm_output.strip():
-                logger.warning("⚠️ Empty LLM output, using fallback label.")
-                return MindmapNode(label=self._create_fallback_label(texts))
+            formatted_prompt = self._build_prompt(texts, depth, parent_label, lang)
+            cache_key = self.cache.make_key(self.llm.model, formatted_prompt)
+            llm_output = self.cache.get(cache_key)
+            if llm_output is None:
+                llm_output = self.llm.generate(formatted_prompt)
+                if llm_output and llm_output.strip():
+                    self.cache.set(cache_key, llm_output)
+            return self._parse_output(llm_output, texts)
 
-            # Extract JSON substring
-            match = re.search(r"\{[\s\S]*\}", llm_output)
-            cleaned_output = match.group(0).strip() if match else llm_output.strip()
+        except Exception as e:
+            logger.error(f"❌ Label generation failed: {e}")
+            return MindmapNode(label=self._create_fallback_label(texts))
+
+    async def generate_label_async(self, texts, depth=0, parent_label=None,lang="Arabic"):
+        """Async variant of generate_label for concurrent sibling enrichment."""
+        try:
+            formatted_prompt = self._build_prompt(texts, depth, parent_label, lang)
+            cache_key = self.cache.make_key(self.async_llm.model, formatted_prompt)
+            llm_output = self.cache.get(cache_key)
+            if llm_output is None:
+                llm_output = await self.async_llm.generate(formatted_prompt)
+                if llm_output and llm_output.strip():
+                    self.cache.set(cache_key, llm_output)
+            return self._parse_output(llm_output, texts)
 
-            # Remove markdown fences
-            cleaned_output = re.sub(r"^```(json)?|```$", "", cleaned_output, flags=re.MULTILINE).strip()
+        except Exception as e:
+            logger.error(f"❌ Label generation failed: {e}")
+            return MindmapNode(label=self._create_fallback_label(texts))
+
+    async def batch_generate_labels(self, requests, max_concurrent=32):
+        """Label many clusters concurrently with a bounded number of in-flight calls.
+
+        `requests` is a list of (texts, depth, parent_label, lang) tuples;
+        labels come back in the same order. N serial LLM round-trips collapse
+        to roughly one round-trip of wall-clock time.
+        """
+        semaphore = asyncio.Semaphore(max_concurrent)
+
+        async def bounded(texts, depth, parent_label, lang):
+            async with semaphore:
+                return await self.generate_label_async(texts, depth, parent_label, lang)
+
+        return await asyncio.gather(
+            *(bounded(texts, depth, parent_label, lang)
+              for texts, depth, parent_label, lang in requests)
+        )
+
+    def batch_generate_labels_sync(self, requests, max_workers=8):
+        """Thread-based counterpart of batch_generate_labels for sync callers.
+
+        Groq calls are HTTPS waits that release the GIL, so a small thread
+        pool overlaps their round-trips; labels come back in input order.
+        """
+        with ThreadPoolExecutor(max_workers=min(max_workers, max(1, len(requests)))) as executor:
+            futures = [
+                executor.submit(self.generate_label, texts, depth, parent_label, lang)
+                for texts, depth, parent_label, lang in requests
+            ]
+            return [future.result() for future in futures]
+
+    def _parse_output(self, llm_output, texts):
+        """Parse and validate raw LLM output into a MindmapNode."""
+        if not llm_output or not llm_output.strip():
+            logger.warning("⚠️ Empty LLM output, using fallback label.")
+            return MindmapNode(label=self._create_fallback_label(texts))
+
+        # Fast path: pull the label straight out with one compiled pattern
+        match = _LABEL_RE.search(llm_output)
+        if match:
+            result = MindmapNode(label=match.group(1))
+        else:
+            # Slow path: isolate the JSON object, strip fences, parse with orjson
+            match = _JSON_OBJ_RE.search(llm_output)
+            cleaned_output = match.group(0).strip() if match else llm_output.strip()
+            cleaned_output = _FENCE_RE.sub("", cleaned_output).strip()
 
             try:
-                result = self.parser.parse(cleaned_output)
+                result = MindmapNode(**orjson.loads(cleaned_output))
             except Exception:
-                try:
-                    data = json.loads(cleaned_output)
-                    result = MindmapNode(**data)
-                except JSONDecodeError:
-                    logger.warning(f"⚠️ Could not parse JSON: {cleaned_output[:120]}...")
-                    return MindmapNode(label=self._create_fallback_label(texts))
-
-            # Ensure we have a MindmapNode object
-            if isinstance(result, dict):
-                result = MindmapNode(**result)
-
-            # Validate label quality
-            label = getattr(result, "label", "").strip()
-            
-            # Check for invalid labels
-            invalid_labels = ["root", "unnamed cluster", "cluster", "node", "unnamed", "n/a", ""]
-            if not label or label.lower() in invalid_labels:
-                logger.warning(f"⚠️ Invalid label generated: '{label}', using fallback")
-                result.label = self._create_fallback_label(texts)
-            else:
-                result.label = label
+                logger.warning(f"⚠️ Could not parse JSON: {cleaned_output[:120]}...")
+                return MindmapNode(label=self._create_fallback_label(texts))
 
-            logger.info(f"✅ Generated label: {result.label}")
-            return result
+        # Validate label quality
+        label = getattr(result, "label", "").strip()
+        
+        # Check for invalid labels
+        invalid_labels = ["root", "unnamed cluster", "cluster", "node", "unnamed", "n/a", ""]
+        if not label or label.lower() in invalid_labels:
+            logger.warning(f"⚠️ Invalid label generated: '{label}', using fallback")
+            result.label = self._create_fallback_label(texts)
+        else:
+            result.label = label
 
-        except Exception as e:
-            logger.error(f"❌ Label generation failed: {e}")
-            return MindmapNode(label=self._create_fallback_label(texts))
+        logger.info(f"✅ Generated label: {result.label}")
+        return result
 
     def _create_fallback_label(self, texts):
         """Create a simple fallback label from the first few words of text"""
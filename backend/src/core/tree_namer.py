@@ -1,25 +1,29 @@
 import logging
 import json
-from backend.infrastructure.llm import GroqClient
+from backend.infrastructure.llm import get_groq_client
 
 logger = logging.getLogger("TreeNamer")
 
 
 class TreeNamerService:
     def __init__(self):
-        self.llm = GroqClient()
+        self.llm = get_groq_client()
 
     def summarize_tree(self, node, depth=0):
         """
-        Recursively collect labels and descriptions from the tree.
+        Collect labels and descriptions from the tree with an explicit
+        stack (no recursion), joining the lines once at the end.
         """
-        text = []
-        if "label" in node:
-            text.append(f"{'  ' * depth}- {node['label']}: {node.get('description', '')}")
-        if "clusters" in node:
-            for child in node["clusters"].values():
-                text.append(self.summarize_tree(child, depth + 1))
-        return "\n".join(t for t in text if t)
+        lines = []
+        stack = [(node, depth)]
+        while stack:
+            current, level = stack.pop()
+            if "label" in current:
+                lines.append(f"{'  ' * level}- {current['label']}: {current.get('description', '')}")
+            children = list(current.get("clusters", {}).values())
+            for child in reversed(children):
+                stack.append((child, level + 1))
+        return "\n".join(lines)
 
     def generate_tree_name(self, enriched_tree, lang="Arabic"):
         """
@@ -1,13 +1,20 @@
-import json
+import orjson
 
 class JSONPreprocessor:
     def load_and_preprocess_data(self, file_path):
-        with open(file_path, "r", encoding="utf-8") as f:
-            try:
-                data = json.load(f)  
-            except json.JSONDecodeError:
-                f.seek(0)  
-                return [f.read()]
+        # Read bytes once and hand off to the bytes parser; callers that
+        # already hold the payload in memory can skip the file entirely
+        with open(file_path, "rb") as f:
+            raw = f.read()
+        return self.load_from_bytes(raw)
+
+    def load_from_bytes(self, raw):
+        # Parse with orjson; fall back to treating the payload as plain
+        # text when it isn't valid JSON
+        try:
+            data = orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            return [raw.decode("utf-8")]
 
         if isinstance(data, dict):
             texts = [str(v) for v in data.values() if isinstance(v, str) and len(str(v).strip()) > 0]
@@ -27,8 +34,4 @@ class JSONPreprocessor:
             return texts if texts else [str(data)]
 
 
-        if isinstance(data, list):
-            return [str(item) for item in data if len(str(item).strip()) > 0]
-
-
-        return [str(data)]
\ No newline at end of file
+        return [str(data)]
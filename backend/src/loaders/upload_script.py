@@ -1,24 +1,33 @@
 from pathlib import Path
-from PyPDF2 import PdfReader
+import pypdfium2 as pdfium
 
 def pdf_to_paragraphs(pdf_path: str) -> list[str]:
     """
     Extract text from a PDF and return it as a list of paragraphs.
     Each paragraph will be cleaned of empty lines.
+
+    Uses pypdfium2 (PDFium C++ bindings), which extracts text far faster
+    than the pure-Python PyPDF2 reader it replaces.
     """
     pdf_file = Path(pdf_path)
 
     if not pdf_file.exists():
         raise FileNotFoundError(f"File not found: {pdf_file}")
 
-    reader = PdfReader(pdf_file)
+    pdf = pdfium.PdfDocument(pdf_file)
     paragraphs = []
 
-    for page in reader.pages:
-        text = page.extract_text() or ""
-        # Split into paragraphs
-        parts = [p.strip() for p in text.split("\n") if p.strip()]
-        paragraphs.extend(parts)
+    try:
+        for page in pdf:
+            textpage = page.get_textpage()
+            text = textpage.get_text_range() or ""
+            # Split into paragraphs
+            parts = [p.strip() for p in text.split("\n") if p.strip()]
+            paragraphs.extend(parts)
+            textpage.close()
+            page.close()
+    finally:
+        pdf.close()
 
     return paragraphs
 
@@ -2,31 +2,46 @@
 
 import os
 import webbrowser
+import numpy as np
 import plotly.graph_objects as go
 
-def visualize_mindmap_tree(mindmap_data, output_html="mindmap_output.html"):
+def visualize_mindmap_tree(mindmap_data, output_html="mindmap_output.html", detail_hover=True):
     """
     Visualize a hierarchical mindmap (tree layout) using Plotly with auto spacing.
+
+    Set detail_hover=False to skip per-node description hover text; it is
+    also dropped automatically past 1000 nodes, where building and picking
+    the long hover strings hurts interactivity.
     """
     nodes = []
     edges = []
 
-    # Compute layout dynamically so children spread horizontally
-    def traverse(node, parent_id=None, depth=0, x_offset=0):
+    # One post-order pass over the tree memoizes every subtree's width
+    # (number of leaves), instead of recomputing it per ancestor.
+    widths = {}
+    stack = [(mindmap_data, False)]
+    while stack:
+        node, children_done = stack.pop()
+        children = list(node.get("clusters", {}).values())
+        if not children:
+            widths[id(node)] = 1
+        elif children_done:
+            widths[id(node)] = sum(widths[id(child)] for child in children)
+        else:
+            stack.append((node, True))
+            for child in children:
+                stack.append((child, False))
+
+    # Iterative layout traversal so children spread horizontally
+    stack = [(mindmap_data, None, 0, 0.0)]
+    while stack:
+        node, parent_id, depth, x_offset = stack.pop()
         node_id = id(node)
         label = node.get("label") or (" ".join(node.get("texts", []))[:60] + "...")
         desc = node.get("description", "")
         children = list(node.get("clusters", {}).values())
 
-        # Recursively get width (number of leaf nodes)
-        def get_subtree_width(n):
-            c = n.get("clusters", {})
-            if not c:
-                return 1
-            return sum(get_subtree_width(child) for child in c.values())
-
-        width = get_subtree_width(node)
-        node_x = x_offset + width / 2.0  # center of this subtree
+        node_x = x_offset + widths[node_id] / 2.0  # center of this subtree
         node_y = -depth * 2.0  # vertical distance between levels
 
         nodes.append({
@@ -45,61 +60,81 @@ def visualize_mindmap_tree(mindmap_data, output_html="mindmap_output.html"):
         # Spread children horizontally
         child_x = x_offset
         for child in children:
-            child_width = get_subtree_width(child)
-            traverse(child, node_id, depth + 1, child_x)
-            child_x += child_width
-
-    # Start traversal from root
-    traverse(mindmap_data)
-
-    # Build edges
-    edge_x, edge_y = [], []
-    node_positions = {n["id"]: (n["x"], n["y"]) for n in nodes}
-    for parent, child in edges:
-        x0, y0 = node_positions[parent]
-        x1, y1 = node_positions[child]
-        edge_x += [x0, x1, None]
-        edge_y += [y0, y1, None]
-
-    # Build node traces
-    node_x = [n["x"] for n in nodes]
-    node_y = [n["y"] for n in nodes]
-    labels = [n["label"] for n in nodes]
-    hover_texts = [f"<b>{n['label']}</b><br>{n['desc']}" for n in nodes]
-
-    fig = go.Figure()
-
-    # Edges
-    fig.add_trace(go.Scatter(
-        x=edge_x, y=edge_y,
-        mode='lines',
-        line=dict(width=1, color='rgba(100,100,100,0.5)'),
-        hoverinfo='none'
-    ))
-
-    # Nodes
-    fig.add_trace(go.Scatter(
-        x=node_x, y=node_y,
-        mode='markers+text',
-        text=labels,
-        textposition='bottom center',
-        hoverinfo='text',
-        hovertext=hover_texts,
-        marker=dict(size=12, color='lightblue', line=dict(width=1, color='darkblue'))
-    ))
-
-    # Layout
-    fig.update_layout(
-        title="🌳 Hierarchical Mindmap (Tree Layout)",
-        showlegend=False,
-        hovermode='closest',
-        margin=dict(t=60, l=20, r=20, b=20),
-        xaxis=dict(visible=False),
-        yaxis=dict(visible=False),
-        plot_bgcolor='white',
-        height=1000,
-        width=1600
-    )
+            stack.append((child, node_id, depth + 1, child_x))
+            child_x += widths[id(child)]
+
+    # Build all node arrays in a single pass over nodes; edge polylines are
+    # assembled with strided numpy assignment (x0, x1, NaN separator per
+    # edge) instead of appending triples in a Python loop
+    with_descriptions = detail_hover and len(nodes) <= 1000
+    node_x = np.empty(len(nodes))
+    node_y = np.empty(len(nodes))
+    labels = []
+    hover_texts = []
+    node_index = {}
+    for i, n in enumerate(nodes):
+        node_x[i] = n["x"]
+        node_y[i] = n["y"]
+        labels.append(n["label"])
+        if with_descriptions:
+            hover_texts.append(f"<b>{n['label']}</b><br>{n['desc']}")
+        node_index[n["id"]] = i
+    if not with_descriptions:
+        hover_texts = labels
+
+    if edges:
+        edge_pairs = np.array([(node_index[parent], node_index[child]) for parent, child in edges])
+        # Sorting by source index makes the fancy-indexed gathers below walk
+        # node_x/node_y mostly sequentially instead of jumping around
+        edge_pairs = edge_pairs[np.argsort(edge_pairs[:, 0], kind="stable")]
+        edge_x = np.empty(3 * len(edge_pairs))
+        edge_y = np.empty(3 * len(edge_pairs))
+        edge_x[0::3] = node_x[edge_pairs[:, 0]]
+        edge_x[1::3] = node_x[edge_pairs[:, 1]]
+        edge_x[2::3] = np.nan
+        edge_y[0::3] = node_y[edge_pairs[:, 0]]
+        edge_y[1::3] = node_y[edge_pairs[:, 1]]
+        edge_y[2::3] = np.nan
+    else:
+        edge_x = edge_y = np.empty(0)
+
+    # Plain-dict traces and layout skip the per-property graph_objects
+    # validation, which is measurable on large coordinate arrays.
+    # Edges render through WebGL (scattergl): SVG scales poorly past a few
+    # hundred points.
+    edge_trace = {
+        "type": "scattergl",
+        "x": edge_x, "y": edge_y,
+        "mode": "lines",
+        "line": {"width": 1, "color": "rgba(100,100,100,0.5)"},
+        "hoverinfo": "none"
+    }
+
+    node_trace = {
+        "type": "scattergl",
+        "x": node_x, "y": node_y,
+        "mode": "markers+text",
+        "text": labels,
+        "textposition": "bottom center",
+        "hoverinfo": "text",
+        "hovertext": hover_texts,
+        "marker": {"size": 12, "color": "lightblue", "line": {"width": 1, "color": "darkblue"}}
+    }
+
+    layout = {
+        "title": "🌳 Hierarchical Mindmap (Tree Layout)",
+        "showlegend": False,
+        "hovermode": "closest",
+        "margin": {"t": 60, "l": 20, "r": 20, "b": 20},
+        "xaxis": {"visible": False},
+        "yaxis": {"visible": False},
+        "plot_bgcolor": "white",
+        "height": 1000,
+        "width": 1600,
+        "template": None
+    }
+
+    fig = go.Figure({"data": [edge_trace, node_trace], "layout": layout}, skip_invalid=True)
 
     # Save and open
     fig.write_html(output_html)
@@ -1,3 +1,6 @@
+from collections import Counter
+from functools import lru_cache
+
 from langdetect import detect, DetectorFactory
 import logging
 
@@ -6,10 +9,10 @@ DetectorFactory.seed = 0
 
 # Set up logger
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.WARNING)
 
+@lru_cache(maxsize=256)
 def returnlang(text):
-    """Detect language of the input text."""
+    """Detect language of the input text (memoized per text)."""
     try:
         detected = detect(text)
         lang_mapping = {
@@ -20,3 +23,16 @@ def returnlang(text):
     except Exception as e:
         logger.warning(f"Language detection failed: {e}. Defaulting to English.")
         return 'English'
+
+def detect_document_language(paragraphs):
+    """Detect a document's language from a head/middle/tail sample.
+
+    Running the detector on a few spread-out paragraphs and voting is far
+    cheaper than detecting every paragraph, and more robust than trusting
+    only the first one (which is often a title or boilerplate).
+    """
+    if not paragraphs:
+        return 'English'
+    sample_positions = {0, len(paragraphs) // 2, len(paragraphs) - 1}
+    votes = Counter(returnlang(paragraphs[i]) for i in sample_positions)
+    return votes.most_common(1)[0][0]
@@ -0,0 +1,52 @@
+import os
+import json
+import logging
+from hashlib import blake2b
+
+logger = logging.getLogger(__name__)
+
+
+class LLMCache:
+    """
+    Disk-backed cache for raw LLM outputs.
+
+    Keys are BLAKE2b digests of the model name plus the fully formatted
+    prompt, so changing the model, the prompt template, the text samples,
+    depth, parent label, or language all naturally invalidate the entry.
+    Each entry is one small JSON file under the cache directory, which keeps
+    hits cheap and makes the cache easy to inspect or clear.
+    """
+
+    def __init__(self, cache_dir: str = "cache/llm"):
+        self.cache_dir = cache_dir
+
+    def make_key(self, model: str, prompt: str) -> str:
+        h = blake2b(digest_size=16)
+        h.update(model.encode("utf-8"))
+        h.update(prompt.encode("utf-8"))
+        return h.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str):
+        """Return the cached output for key, or None on a miss."""
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            logger.debug(f"LLM cache hit: {key}")
+            return entry.get("output")
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Could not read LLM cache entry {key}: {e}")
+            return None
+
+    def set(self, key: str, output: str) -> None:
+        """Persist an LLM output under key."""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(self._path(key), "w", encoding="utf-8") as f:
+                json.dump({"output": output}, f, ensure_ascii=False)
+        except Exception as e:
+            logger.warning(f"Could not write LLM cache entry {key}: {e}")
@@ -5,25 +5,28 @@ from logging.handlers import RotatingFileHandler
 
 def get_logger(name: str, log_level=logging.INFO, log_dir="logs", log_file="app.log"):
     """
-    Returns a logger instance with console and file handlers.
-    
+    Returns a logger instance, configuring console and file handlers once.
+
+    Handlers live on the root logger so that every module logger in the
+    pipeline (NodeLabeler, Clustering, the embedder, ...) propagates up and
+    is emitted exactly once — no per-logger handlers, no duplicated lines.
+
     Args:
         name (str): Logger name (usually __name__).
         log_level (int): Logging level (default: INFO).
         log_dir (str): Directory to store log files.
         log_file (str): Log file name.
     """
-    
+
     # Ensure log directory exists
     if not os.path.exists(log_dir):
         os.makedirs(log_dir)
 
-    # Create logger
-    logger = logging.getLogger(name)
-    logger.setLevel(log_level)
+    root = logging.getLogger()
+    root.setLevel(log_level)
 
     # Prevent duplicate handlers if re-imported
-    if not logger.handlers:
+    if not root.handlers:
         # Console handler
         console_handler = logging.StreamHandler()
         console_handler.setLevel(log_level)
@@ -35,7 +38,8 @@ def get_logger(name: str, log_level=logging.INFO, log_dir="logs", log_file="app.
 
         # File handler (rotating logs, 5 MB per file, keep 5 backups)
         file_handler = RotatingFileHandler(
-            os.path.join(log_dir, log_file), maxBytes=5 * 1024 * 1024, backupCount=5
+            os.path.join(log_dir, log_file), maxBytes=5 * 1024 * 1024, backupCount=5,
+            delay=True
         )
         file_handler.setLevel(log_level)
         file_format = logging.Formatter(
@@ -44,7 +48,11 @@ def get_logger(name: str, log_level=logging.INFO, log_dir="logs", log_file="app.
         file_handler.setFormatter(file_format)
 
         # Add handlers
-        logger.addHandler(console_handler)
-        logger.addHandler(file_handler)
+        root.addHandler(console_handler)
+        root.addHandler(file_handler)
+
+    # Create logger
+    logger = logging.getLogger(name)
+    logger.setLevel(log_level)
 
     return logger
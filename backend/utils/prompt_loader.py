@@ -1,19 +1,29 @@
 import os
+from functools import lru_cache
+
 import yaml
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # libyaml not available
+    from yaml import SafeLoader
+
+# Resolved once at import; prompt paths are relative to this directory
+_CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
 class PromptLoader:
     """Handles loading and managing system prompts."""
-    
+
     @staticmethod
+    @lru_cache(maxsize=32)
     def load_system_prompt(path) -> str:
-        """Load system prompt from YAML file."""
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        prompt_path = os.path.join(current_dir, path)
-        prompt_path = os.path.abspath(prompt_path)
+        """Load system prompt from YAML file (cached per path)."""
+        prompt_path = os.path.abspath(os.path.join(_CURRENT_DIR, path))
 
         try:
             with open(prompt_path, "r", encoding="utf-8") as f:
-                data = yaml.safe_load(f)
+                data = yaml.load(f, Loader=SafeLoader)
             return data.get("SYSTEM_PROMPT", "")
         except FileNotFoundError:
             print(f"Warning: Prompt file not found at {prompt_path}")
@@ -21,4 +31,3 @@ class PromptLoader:
         except Exception as e:
             print(f"Error loading prompt: {e}")
             return "You are a helpful AI assistant."
-
@@ -3,18 +3,25 @@
 Visualization scripts for mindmap clustering - Optional module
 """
 
-import matplotlib.pyplot as plt
+import hashlib
+import json
+import os
+
 import numpy as np
 from sklearn.decomposition import PCA
 from sklearn.manifold import TSNE
-import seaborn as sns
 import networkx as nx
-from matplotlib.patches import FancyBboxPatch
 import plotly.graph_objects as go
 import plotly.express as px
 from plotly.subplots import make_subplots
 import plotly.offline as pyo
 
+# Layout positions keyed by graph-structure hash; the disk copy keeps the
+# cache warm across process restarts
+_LAYOUT_CACHE = {}
+_LAYOUT_CACHE_DIR = "cache/layout"
+
+
 class MindmapVisualizer:
     """
     Comprehensive visualization system for mindmap clustering results
@@ -87,59 +94,63 @@ class MindmapVisualizer:
         
         # Create interactive scatter plot
         fig = go.Figure()
-        
-        # Add points for each cluster
-        for cluster_id in set(labels):
-            cluster_mask = labels == cluster_id
-            cluster_coords = coords_2d[cluster_mask]
-            cluster_texts = [texts[i] for i, mask in enumerate(cluster_mask) if mask]
-            
-            # Find branch info
-            branch = next((b for b in branches if int(b['id'].split('_')[1]) == cluster_id), None)
-            branch_title = branch['title'] if branch else f"Cluster {cluster_id}"
-            
-            fig.add_trace(go.Scatter(
-                x=cluster_coords[:, 0],
-                y=cluster_coords[:, 1],
-                mode='markers+text',
-                name=branch_title,
-                text=[f"C{cluster_id}-{i+1}" for i in range(len(cluster_coords))],
-                textposition="middle center",
-                hovertext=[self._create_display_text(text, 100) for text in cluster_texts],
-                hovertemplate="<b>%{text}</b><br>%{hovertext}<extra></extra>",
-                marker=dict(
-                    size=12,
-                    color=color_map[cluster_id],
-                    line=dict(width=2, color='white'),
-                    opacity=0.8
-                )
-            ))
-        
-        # Add cluster centers
+
+        # Branch titles looked up once per cluster
+        branch_titles = {}
         for cluster_id in set(labels):
-            cluster_mask = labels == cluster_id
-            cluster_coords = coords_2d[cluster_mask]
-            center = np.mean(cluster_coords, axis=0)
-            
-            # Add cluster center
             branch = next((b for b in branches if int(b['id'].split('_')[1]) == cluster_id), None)
-            branch_title = branch['title'] if branch else f"Cluster {cluster_id}"
-            
-            fig.add_trace(go.Scatter(
-                x=[center[0]],
-                y=[center[1]],
-                mode='markers+text',
-                name=f"Center: {branch_title}",
-                text=[branch_title],
-                textposition="bottom center",
-                showlegend=False,
-                marker=dict(
-                    size=20,
-                    color=color_map[cluster_id],
-                    symbol='diamond',
-                    line=dict(width=3, color='black')
-                )
-            ))
+            branch_titles[cluster_id] = branch['title'] if branch else f"Cluster {cluster_id}"
+
+        # One trace for all points: flat coordinate/color/text arrays instead
+        # of a trace per cluster, so Plotly setup stays O(1) in cluster count
+        counters = {cluster_id: 0 for cluster_id in set(labels)}
+        point_text = []
+        point_colors = []
+        point_hover = []
+        for i, cluster_id in enumerate(labels):
+            counters[cluster_id] += 1
+            point_text.append(f"C{cluster_id}-{counters[cluster_id]}")
+            point_colors.append(color_map[cluster_id])
+            point_hover.append(self._create_display_text(texts[i], 100))
+
+        fig.add_trace(go.Scatter(
+            x=coords_2d[:, 0],
+            y=coords_2d[:, 1],
+            mode='markers+text',
+            name='Concepts',
+            text=point_text,
+            textposition="middle center",
+            hovertext=point_hover,
+            hovertemplate="<b>%{text}</b><br>%{hovertext}<extra></extra>",
+            marker=dict(
+                size=12,
+                color=point_colors,
+                line=dict(width=2, color='white'),
+                opacity=0.8
+            )
+        ))
+
+        # One trace for all cluster centers
+        center_ids = sorted(set(labels))
+        centers = np.array([
+            coords_2d[labels == cluster_id].mean(axis=0) for cluster_id in center_ids
+        ])
+
+        fig.add_trace(go.Scatter(
+            x=centers[:, 0],
+            y=centers[:, 1],
+            mode='markers+text',
+            name='Cluster centers',
+            text=[branch_titles[cluster_id] for cluster_id in center_ids],
+            textposition="bottom center",
+            showlegend=False,
+            marker=dict(
+                size=20,
+                color=[color_map[cluster_id] for cluster_id in center_ids],
+                symbol='diamond',
+                line=dict(width=3, color='black')
+            )
+        ))
         
         # Update layout
         fig.update_layout(
@@ -165,6 +176,9 @@ class MindmapVisualizer:
     
     def _create_static_mindmap(self, embeddings, labels, texts, branches, save_path=None, result=None):
         """Create static matplotlib mindmap visualization"""
+        # matplotlib is imported lazily: only the static/network renderers
+        # need it, and the interactive path shouldn't pay its import cost
+        import matplotlib.pyplot as plt
         
         # Reduce dimensionality
         if embeddings.shape[1] > 2:
@@ -250,8 +264,129 @@ class MindmapVisualizer:
         
         plt.show()
     
+    def _layout_cache_key(self, G):
+        """Hash the graph structure (sorted nodes + edges) for layout reuse."""
+        h = hashlib.blake2b(digest_size=16)
+        for node in sorted(G.nodes()):
+            h.update(str(node).encode("utf-8"))
+        for u, v in sorted(G.edges()):
+            h.update(f"{u}->{v}".encode("utf-8"))
+        return h.hexdigest()
+
+    def _compute_layout(self, G, seed=42):
+        """
+        Compute node positions for the network view.
+
+        Positions are cached in-process and on disk keyed by the graph
+        structure, so re-rendering an unchanged mindmap skips layout
+        entirely. Small graphs use networkx's spring layout directly. Past
+        ~500 nodes the pure-Python Fruchterman-Reingold loop becomes the
+        bottleneck, so larger graphs minimize the same force energy with
+        scipy's L-BFGS: attraction is evaluated over the sparse edge list
+        and repulsion over KD-tree neighbor pairs plus grid-aggregated
+        far-field pseudo-particles.
+        """
+        key = self._layout_cache_key(G)
+        if key in _LAYOUT_CACHE:
+            return _LAYOUT_CACHE[key]
+
+        cache_file = os.path.join(_LAYOUT_CACHE_DIR, f"{key}.json")
+        try:
+            with open(cache_file, "r", encoding="utf-8") as f:
+                pos = {node: np.array(xy) for node, xy in json.load(f).items()}
+            _LAYOUT_CACHE[key] = pos
+            return pos
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"⚠️  Could not read layout cache: {e}")
+
+        pos = self._compute_layout_uncached(G, seed)
+
+        _LAYOUT_CACHE[key] = pos
+        try:
+            os.makedirs(_LAYOUT_CACHE_DIR, exist_ok=True)
+            with open(cache_file, "w", encoding="utf-8") as f:
+                json.dump({str(node): list(map(float, xy)) for node, xy in pos.items()}, f)
+        except Exception as e:
+            print(f"⚠️  Could not write layout cache: {e}")
+
+        return pos
+
+    def _compute_layout_uncached(self, G, seed=42):
+        n = G.number_of_nodes()
+        if n < 500:
+            return nx.spring_layout(G, k=3, iterations=50, seed=seed)
+
+        from scipy import optimize, spatial
+
+        nodes = list(G.nodes())
+        index = {node: i for i, node in enumerate(nodes)}
+        edges = np.array([(index[u], index[v]) for u, v in G.edges()])
+
+        k = 1.0 / np.sqrt(n)  # ideal edge length
+        cutoff = 3.0 * k      # repulsion radius
+
+        rng = np.random.default_rng(seed)
+        x0 = rng.random((n, 2))
+
+        def energy(flat):
+            pos = flat.reshape(n, 2)
+            grad = np.zeros_like(pos)
+
+            # Attractive energy d^3/(3k) along edges (FR attraction d^2/k)
+            delta = pos[edges[:, 0]] - pos[edges[:, 1]]
+            dist = np.linalg.norm(delta, axis=1) + 1e-9
+            total = (dist ** 3 / (3.0 * k)).sum()
+            force = (dist / k)[:, None] * delta
+            np.add.at(grad, edges[:, 0], force)
+            np.add.at(grad, edges[:, 1], -force)
+
+            # Short-range repulsion k^2*ln(cutoff/d) over KD-tree pairs
+            pairs = spatial.cKDTree(pos).query_pairs(r=cutoff, output_type="ndarray")
+            if len(pairs):
+                delta = pos[pairs[:, 0]] - pos[pairs[:, 1]]
+                dist = np.linalg.norm(delta, axis=1) + 1e-9
+                total += (k * k * np.log(cutoff / dist)).sum()
+                force = (k * k / (dist ** 2))[:, None] * delta
+                np.add.at(grad, pairs[:, 0], -force)
+                np.add.at(grad, pairs[:, 1], force)
+
+            # Far-field repulsion, Barnes-Hut style: aggregate points into
+            # grid cells (cell size = cutoff) and treat each non-adjacent
+            # cell as one pseudo-particle at its center of mass, so the
+            # all-pairs O(n^2) term becomes O(n * cells).
+            cells = np.floor(pos / cutoff).astype(np.int64)
+            unique_cells, inverse, counts = np.unique(
+                cells, axis=0, return_inverse=True, return_counts=True
+            )
+            centers = np.zeros((len(unique_cells), 2))
+            np.add.at(centers, inverse, pos)
+            centers /= counts[:, None]
+
+            delta = pos[:, None, :] - centers[None, :, :]
+            dist = np.linalg.norm(delta, axis=2) + 1e-9
+            # Mask out each point's own cell and its 8 neighbors (handled
+            # exactly by the KD-tree term above)
+            cell_gap = np.abs(cells[:, None, :] - unique_cells[None, :, :]).max(axis=2)
+            far = cell_gap > 1
+            weight = np.where(far, counts[None, :].astype(float), 0.0)
+            total += -(k * k * weight * np.log(dist)).sum()
+            force = (k * k * weight / (dist ** 2))[:, :, None] * delta
+            grad -= force.sum(axis=1)
+
+            return total, grad.ravel()
+
+        result = optimize.minimize(
+            energy, x0.ravel(), jac=True, method="L-BFGS-B",
+            options={"maxiter": 50}
+        )
+        positions = result.x.reshape(n, 2)
+        return {node: positions[i] for node, i in index.items()}
+
     def _create_network_mindmap(self, embeddings, labels, texts, branches, save_path=None):
         """Create network graph visualization of the mindmap"""
+        import matplotlib.pyplot as plt
         
         G = nx.Graph()
         
@@ -281,8 +416,8 @@ class MindmapVisualizer:
         # Create visualization
         plt.figure(figsize=(14, 10))
         
-        # Use spring layout for better visualization
-        pos = nx.spring_layout(G, k=3, iterations=50)
+        # Use spring layout for better visualization (sparse path on big graphs)
+        pos = self._compute_layout(G)
         
         # Draw different node types
         center_nodes = [n for n, d in G.nodes(data=True) if d['type'] == 'center']
@@ -3,8 +3,8 @@ ThoughtFlow Mindmap Creator - Main Script
 
 A standalone script to generate mindmaps from documents using embeddings, clustering, and LLM enrichment.
 """
-import numpy as np
-import json
+import asyncio
+import orjson
 import logging
 import time
 import sys
@@ -17,24 +17,21 @@ sys.path.insert(0, str(project_root))
 # --- 1. Imports ---
 # Grouped by functionality (Loaders, Core Processing, Infrastructure, Utils, Visualizer)
 from backend.src.loaders.upload_json import JSONPreprocessor
-from backend.src.core.cleaning_script import preprocess
+from backend.src.core.cleaning_script import preprocess_batch
 from backend.src.core.dynamic_clustering import recursive_cluster
 from backend.src.core.node_labeler import NodeLabelerService
 from backend.src.core.node_description import NodeDescriptionService
 from backend.src.core.tree_namer import TreeNamerService
-from backend.utils.language_detector import returnlang
+from backend.utils.language_detector import detect_document_language
+from backend.utils.logging_handler import get_logger
 from backend.infrastructure.embedder import get_embedding_service
-from backend.infrastructure.llm import GroqClient
+from backend.infrastructure.llm import GroqClient, get_groq_client
 from backend.src.visualizers.mindmap_visualizer import visualize_mindmap_tree
 from config.settings import settings
 
 # --- 2. Configuration & Initialization ---
-# Configure logging
-logging.basicConfig(
-    level=getattr(logging, settings.LOG_LEVEL),
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
-logger = logging.getLogger(__name__)
+# Configure logging once through the shared handler setup
+logger = get_logger("thoughtflow", log_level=getattr(logging, settings.LOG_LEVEL))
 
 # General Configuration (using settings)
 CONFIG = {
@@ -43,13 +40,13 @@ CONFIG = {
     "EMBEDDING_BATCH_SIZE": settings.EMBEDDING_BATCH_SIZE,
     "MAX_CLUSTER_DEPTH": settings.MAX_DEPTH_LIMIT,
     "MIN_CLUSTER_SIZE": settings.MIN_SIZE_LIMIT,
-    "LLM_SLEEP_TIME": 0.5  # Time to wait between LLM calls to avoid rate limits
+    "LLM_CONCURRENCY": 8  # Max concurrent LLM calls, to respect rate limits
 }
 
 # Service Initialization (can be done once)
 json_preprocessor = JSONPreprocessor()
 tree_namer_service = TreeNamerService()
-llm_client = GroqClient()
+llm_client = get_groq_client()
 embedder_service = get_embedding_service()
 labeler_service = NodeLabelerService()
 describer_service = NodeDescriptionService()
@@ -71,34 +68,56 @@ def test_llm_connection(llm_client: GroqClient) -> bool:
         logger.error(f"❌ LLM test failed: {e}")
         return False
 
-def enrich_node_recursively(node: dict, depth: int = 0, parent_label: str = None, lang='Arabic') -> dict:
-    """Recursively enrich tree nodes with labels and descriptions using LLM services."""
+async def enrich_node_recursively(node: dict, depth: int = 0, parent_label: str = None, lang='Arabic',
+                                  semaphore: asyncio.Semaphore = None) -> dict:
+    """Recursively enrich tree nodes with labels and descriptions using LLM services.
+
+    Sibling subtrees are enriched concurrently with asyncio.gather; the shared
+    semaphore caps in-flight GROQ calls to stay under rate limits.
+    """
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(CONFIG["LLM_CONCURRENCY"])
+
     if "texts" in node:
         num_texts = len(node["texts"])
         logger.info(f"Processing node at depth {depth} with {num_texts} texts.")
-        
+
         try:
-            # Generate label
-            label_obj = labeler_service.generate_label(node["texts"], depth, parent_label, lang=lang)
+            # Generate label first — children need it as their parent topic
+            async with semaphore:
+                label_obj = await labeler_service.generate_label_async(node["texts"], depth, parent_label, lang=lang)
             node["label"] = label_obj.label
             logger.debug(f"Generated label: {label_obj.label}")
-            time.sleep(CONFIG["LLM_SLEEP_TIME"])
 
-            # Generate description
-            desc = describer_service.generate_description(node["texts"], label_obj.label, depth, lang)
+        except Exception as e:
+            logger.error(f"❌ Error labeling node at depth {depth}: {e}")
+            node["label"] = "Error Node"
+            node["description"] = "Failed to generate description"
+            label_obj = None
+
+    async def _describe():
+        try:
+            async with semaphore:
+                desc = await describer_service.generate_description_async(node["texts"], node["label"], depth, lang)
             node["description"] = desc
             logger.debug(f"Generated description: {desc[:50]}...")
-            time.sleep(CONFIG["LLM_SLEEP_TIME"])
-        
         except Exception as e:
-            logger.error(f"❌ Error enriching node at depth {depth}: {e}")
-            node["label"] = "Error Node"
+            logger.error(f"❌ Error describing node at depth {depth}: {e}")
             node["description"] = "Failed to generate description"
 
+    # The description only depends on this node's own label, so it runs
+    # concurrently with the children's enrichment instead of delaying it.
+    tasks = []
+    if "texts" in node and label_obj is not None:
+        tasks.append(_describe())
     if "clusters" in node:
         logger.debug(f"Recursing into {len(node['clusters'])} child clusters at depth {depth}.")
-        for child in node["clusters"].values():
-            enrich_node_recursively(child, depth + 1, node.get("label"), lang)
+        tasks.extend(
+            enrich_node_recursively(child, depth + 1, node.get("label"), lang, semaphore)
+            for child in node["clusters"].values()
+        )
+    if tasks:
+        await asyncio.gather(*tasks)
 
     return node
 
@@ -115,10 +134,10 @@ def generate_mindmap(config: dict) -> dict | None:
         logger.error("❌ No paragraphs extracted. Exiting.")
         return None
 
-    lang = returnlang(paragraphs[0])
+    lang = detect_document_language(paragraphs)
     logger.info(f"Detected language: {lang}")
 
-    cleaned_text = [preprocess(para, lang) for para in paragraphs]
+    cleaned_text = preprocess_batch(paragraphs, lang)
     cleaned_text = [t for t in cleaned_text if t.strip()]
     logger.info(f"Remaining {len(cleaned_text)} cleaned paragraphs.")
 
@@ -126,39 +145,36 @@ def generate_mindmap(config: dict) -> dict | None:
         logger.error("❌ No text remaining after cleaning. Exiting.")
         return None
 
-    # --- Step 2: Generate Embeddings ---
-    logger.info("--- Step 2: Generating Embeddings in batches ---")
-    embeddings = []
     text_count = len(cleaned_text)
-    batch_size = config["EMBEDDING_BATCH_SIZE"]
-    num_batches = (text_count - 1) // batch_size + 1
 
-    for i in range(0, text_count, batch_size):
-        batch = cleaned_text[i:i + batch_size]
-        batch_embeddings = embedder_service.encode(batch)
-        embeddings.extend(batch_embeddings)
-        logger.info(f"Processed batch {i // batch_size + 1}/{num_batches}")
+    # Documents too small to split don't need vectors at all — short-circuit
+    # straight to a single-node tree before paying for any embedding work
+    if text_count < max(2, config["MIN_CLUSTER_SIZE"]):
+        logger.warning("⚠️ Not enough text for clustering. Skipping embedding and clustering.")
+        tree = {"texts": cleaned_text}
+    else:
+        # --- Step 2: Generate Embeddings ---
+        logger.info("--- Step 2: Generating Embeddings ---")
 
-    embeddings = np.array(embeddings)
-    logger.info(f"Embeddings shape: {embeddings.shape}")
+        # One encode call for the whole corpus: the embedding service handles
+        # device mini-batching, length-sorting and caching internally, and
+        # returns a single contiguous array
+        embeddings = embedder_service.encode(cleaned_text, show_progress=True)
+        logger.info(f"Embeddings shape: {embeddings.shape}")
 
-    # --- Step 3: Cluster Hierarchically ---
-    if text_count > 1:
+        # --- Step 3: Cluster Hierarchically ---
         logger.info("--- Step 3: Starting Hierarchical Clustering ---")
         tree = recursive_cluster(
-            embeddings, 
-            cleaned_text, 
-            max_depth=config["MAX_CLUSTER_DEPTH"], 
+            embeddings,
+            cleaned_text,
+            max_depth=config["MAX_CLUSTER_DEPTH"],
             min_size=config["MIN_CLUSTER_SIZE"]
         )
         logger.info("✅ Clustering completed.")
-    else:
-        logger.warning("⚠️ Not enough text for clustering. Skipping clustering.")
-        tree = {"texts": cleaned_text}
 
     # --- Step 4: Enrich the Tree (Labeling/Description) ---
     logger.info("--- Step 4: Enriching tree with labels and descriptions (LLM calls) ---")
-    enriched_tree = enrich_node_recursively(tree, lang=lang)
+    enriched_tree = asyncio.run(enrich_node_recursively(tree, lang=lang))
     logger.info("✅ Tree enrichment completed.")
 
     # Generate a root node for the entire tree
@@ -194,8 +210,10 @@ if __name__ == "__main__":
         # Save the core content of the tree for inspection
         output_data_to_save = final_tree["clusters"]["content"]
         try:
-            with open(CONFIG["OUTPUT_FILE"], 'w', encoding='utf-8') as f:
-                json.dump(output_data_to_save, f, indent=2, ensure_ascii=False)
+            # orjson serializes numpy scalars/arrays natively in C, so the
+            # tree never gets walked in Python to make it JSON-safe
+            with open(CONFIG["OUTPUT_FILE"], 'wb') as f:
+                f.write(orjson.dumps(output_data_to_save, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
             logger.info(f"✅ Saved enriched tree content to {CONFIG['OUTPUT_FILE']}")
         except Exception as e:
             logger.error(f"❌ Failed to save output: {e}")
@@ -204,7 +222,7 @@ if __name__ == "__main__":
         print("\n" + "="*80)
         print(f"ENRICHED MINDMAP TREE PREVIEW (Root Label: {final_tree['label']})")
         print("="*80)
-        print(json.dumps(output_data_to_save, indent=2, ensure_ascii=False)[:3000] + "\n...")
+        print(orjson.dumps(output_data_to_save, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY).decode()[:3000] + "\n...")
 
         # Visualize
         try: